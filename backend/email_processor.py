@@ -1,57 +1,225 @@
-import json
+import asyncio
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, cast
 
+from backend.inbox_loader import build_inbox_index
+from backend.json_io import canonical_dumps, read_json, write_json
 from backend.llm_client import MockLLMClient
 
 
+PROCESS_CACHE_SIZE = 4096
+
+
 class EmailProcessor:
     """Coordinate ingestion pipeline: categorize, extract actions, and draft replies."""
 
-    def __init__(self, state_path: Path, llm_client: Optional[MockLLMClient] = None) -> None:
+    def __init__(
+        self,
+        state_path: Path,
+        llm_client: Optional[MockLLMClient] = None,
+        max_workers: int = 1,
+    ) -> None:
         self.state_path = state_path
         self.llm = llm_client or MockLLMClient()
+        self.max_workers = max_workers
         self.state: Dict[str, Any] = self.load_state()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_dirty = True
+        # Processed results keyed by a hash of (email, prompts); seeded from the persisted
+        # state so a restart does not reprocess an unchanged inbox. Entries are private to the
+        # cache and only ever handed out as copies, so callers editing a result cannot leak
+        # the change into later results.
+        self._proc_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict(
+            (item["cache_key"], copy.deepcopy(item))
+            for item in self.state.get("processed", [])
+            if item.get("cache_key")
+        )
+        self._cache_lock = threading.Lock()
+        # Guards self.state, its on-disk copy and the id index; reentrant because
+        # _store_processed saves while holding it.
+        self._state_lock = threading.RLock()
 
     def load_state(self) -> Dict[str, Any]:
         if not self.state_path.exists():
             return {"processed": []}
-        with self.state_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(self.state_path)
 
     def save_state(self) -> None:
-        self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.state_path.open("w", encoding="utf-8") as f:
-            json.dump(self.state, f, indent=2)
+        with self._state_lock:
+            write_json(self.state_path, self.state)
 
-    def process_email(self, email: Dict[str, Any], prompts: Dict[str, str]) -> Dict[str, Any]:
+    def process_email(
+        self,
+        email: Dict[str, Any],
+        prompts: Dict[str, str],
+        generated_at: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        key = self._cache_key(email, prompts)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         categories = self.llm.categorize_email(email, prompts.get("categorization_prompt", ""))
         actions = self.llm.extract_actions(email, prompts.get("action_item_prompt", ""))
+        return self._finish_processed(email, prompts, key, categories, actions, generated_at)
+
+    def process_batch(
+        self,
+        emails: Sequence[Dict[str, Any]],
+        prompts: Dict[str, str],
+        generated_at: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Process several emails, sending the uncached ones to the client as one batch."""
+        keys = [self._cache_key(email, prompts) for email in emails]
+        results: List[Optional[Dict[str, Any]]] = [self._cache_get(key) for key in keys]
+        misses = [idx for idx, result in enumerate(results) if result is None]
+        if misses:
+            miss_emails = [emails[idx] for idx in misses]
+            categories = self.llm.categorize_batch(miss_emails, prompts.get("categorization_prompt", ""))
+            actions = self.llm.extract_actions_batch(miss_emails, prompts.get("action_item_prompt", ""))
+            for idx, email, email_categories, email_actions in zip(misses, miss_emails, categories, actions):
+                results[idx] = self._finish_processed(
+                    email, prompts, keys[idx], email_categories, email_actions, generated_at
+                )
+        # Every miss has been filled in above.
+        return cast(List[Dict[str, Any]], results)
+
+    def _finish_processed(
+        self,
+        email: Dict[str, Any],
+        prompts: Dict[str, str],
+        key: str,
+        categories: Sequence[str],
+        actions: List[str],
+        generated_at: Optional[str],
+    ) -> Dict[str, Any]:
         draft = self.llm.draft_reply(
             email,
             prompts.get("auto_reply_prompt", ""),
             categories=categories,
             actions=actions,
+            generated_at=generated_at,
         )
         processed = {
             "id": email.get("id"),
             "categories": categories,
             "actions": actions,
             "draft": draft,
+            "cache_key": key,
         }
-        return processed
-
-    def ingest(self, emails: List[Dict[str, Any]], prompts: Dict[str, str]) -> List[Dict[str, Any]]:
-        processed_emails: List[Dict[str, Any]] = []
-        for email in emails:
-            processed = self.process_email(email, prompts)
-            processed_emails.append(processed)
-        self.state["processed"] = processed_emails
-        self.save_state()
+        with self._cache_lock:
+            self._proc_cache[key] = processed
+            if len(self._proc_cache) > PROCESS_CACHE_SIZE:
+                self._proc_cache.popitem(last=False)
+        return copy.deepcopy(processed)
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self._proc_cache.get(key)
+            if cached is None:
+                return None
+            self._proc_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    @staticmethod
+    def _cache_key(email: Dict[str, Any], prompts: Dict[str, str]) -> str:
+        return hashlib.blake2b(canonical_dumps([email, prompts]), digest_size=16).hexdigest()
+
+    def ingest(self, emails: Iterable[Dict[str, Any]], prompts: Dict[str, str]) -> List[Dict[str, Any]]:
+        # Every draft in one ingest run shares the batch timestamp.
+        generated_at = self.llm.now().isoformat() + "Z"
+        process = partial(self.process_email, prompts=prompts, generated_at=generated_at)
+        processed_emails: List[Dict[str, Any]]
+        if self.max_workers <= 1 or (isinstance(emails, Sequence) and len(emails) < 2):
+            # The mock client is CPU-bound Python, so a pool only adds overhead under the GIL.
+            processed_emails = [process(email) for email in emails]
+        else:
+            # Opt-in for clients that block on I/O; map keeps the inbox order.
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                processed_emails = list(executor.map(process, emails))
+        self._store_processed(processed_emails)
         return processed_emails
 
+    def ingest_batch(
+        self,
+        emails: Iterable[Dict[str, Any]],
+        prompts: Dict[str, str],
+        batch_size: int = 32,
+    ) -> List[Dict[str, Any]]:
+        """Ingest the inbox in fixed-size batches of emails with similar body length."""
+        emails, generated_at, buckets = self._plan_batches(emails, batch_size)
+        batches = [
+            self.process_batch([emails[pos] for pos in positions], prompts, generated_at=generated_at)
+            for positions in buckets
+        ]
+        return self._store_batches(len(emails), buckets, batches)
+
+    async def aingest(
+        self,
+        emails: Iterable[Dict[str, Any]],
+        prompts: Dict[str, str],
+        batch_size: int = 32,
+        concurrency: int = 16,
+    ) -> List[Dict[str, Any]]:
+        """Like ingest_batch, but runs up to ``concurrency`` batches at once."""
+        emails, generated_at, buckets = self._plan_batches(emails, batch_size)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_batch(positions: List[int]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                # The client is synchronous, so each batch runs in a worker thread.
+                return await asyncio.to_thread(
+                    self.process_batch, [emails[pos] for pos in positions], prompts, generated_at
+                )
+
+        batches = await asyncio.gather(*(run_batch(positions) for positions in buckets))
+        return self._store_batches(len(emails), buckets, batches)
+
+    def _plan_batches(
+        self, emails: Iterable[Dict[str, Any]], batch_size: int
+    ) -> Tuple[List[Dict[str, Any]], str, List[List[int]]]:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        emails = list(emails)
+        # Every draft in one ingest run shares the batch timestamp.
+        generated_at = self.llm.now().isoformat() + "Z"
+        return emails, generated_at, self._length_buckets(emails, batch_size)
+
+    def _store_batches(
+        self,
+        count: int,
+        buckets: Sequence[List[int]],
+        batches: Sequence[List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        # Put each batch's results back at their inbox positions before storing them.
+        processed_emails: List[Dict[str, Any]] = [{}] * count
+        for positions, batch in zip(buckets, batches):
+            for pos, processed in zip(positions, batch):
+                processed_emails[pos] = processed
+        self._store_processed(processed_emails)
+        return processed_emails
+
+    @staticmethod
+    def _length_buckets(emails: Sequence[Dict[str, Any]], batch_size: int) -> List[List[int]]:
+        # Grouping similar-length bodies keeps the work per batch even; positions map results
+        # back to inbox order.
+        order = sorted(range(len(emails)), key=lambda pos: len(emails[pos].get("body", "")))
+        return [order[start : start + batch_size] for start in range(0, len(order), batch_size)]
+
+    def _store_processed(self, processed_emails: List[Dict[str, Any]]) -> None:
+        with self._state_lock:
+            self.state["processed"] = processed_emails
+            self._index_dirty = True
+            self.save_state()
+
     def get_processed(self, email_id: Any) -> Optional[Dict[str, Any]]:
-        for item in self.state.get("processed", []):
-            if str(item.get("id")) == str(email_id):
-                return item
-        return None
+        with self._state_lock:
+            if self._index_dirty:
+                self._index = build_inbox_index(self.state.get("processed", []))
+                self._index_dirty = False
+            return self._index.get(str(email_id))
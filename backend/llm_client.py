@@ -1,6 +1,77 @@
+import itertools
 import re
+import sys
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional fast path, substring checks are the fallback
+    ahocorasick = None
+
+URGENT_KW = frozenset({"urgent", "asap", "immediately"})
+MEETING_KW = frozenset({"meeting", "schedule", "calendar"})
+FINANCE_KW = frozenset({"invoice", "payment", "billing", "budget"})
+STATUS_KW = frozenset({"update", "status", "progress"})
+ACTION_TOKENS = frozenset({"due", "deadline", "send", "review", "approve"})
+ACTION_PREFIXES = ("please", "kindly", "action:", "todo:", "request:")
+
+TAG_URGENT = sys.intern("urgent")
+TAG_MEETING = sys.intern("meeting")
+TAG_FINANCE = sys.intern("finance")
+TAG_STATUS = sys.intern("status")
+TAG_GENERAL = sys.intern("general")
+
+CATEGORY_KEYWORDS = (
+    (TAG_URGENT, URGENT_KW),
+    (TAG_MEETING, MEETING_KW),
+    (TAG_FINANCE, FINANCE_KW),
+    (TAG_STATUS, STATUS_KW),
+)
+# Every possible categorization result, built once in canonical tag order, so
+# categorize_email hands out shared tuples instead of allocating a list per email.
+_TAG_RESULTS: Dict[FrozenSet[str], Tuple[str, ...]] = {
+    frozenset(combo): combo
+    for size in range(1, len(CATEGORY_KEYWORDS) + 1)
+    for combo in itertools.combinations([tag for tag, _ in CATEGORY_KEYWORDS], size)
+}
+_TAG_RESULTS[frozenset()] = (TAG_GENERAL,)
+
+# Matches whole lines that open with a request cue or mention an action token anywhere,
+# so extract_actions never has to split the body into a list of lines.
+_ACTION_LINE_RE = re.compile(
+    r"^(?:[^\S\n]*(?:"
+    + "|".join(map(re.escape, ACTION_PREFIXES))
+    + r")|[^\n]*(?:"
+    + "|".join(sorted(map(re.escape, ACTION_TOKENS)))
+    + r"))[^\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _build_category_automaton() -> Any:
+    automaton = ahocorasick.Automaton()
+    for tag, words in CATEGORY_KEYWORDS:
+        for word in words:
+            automaton.add_word(word, tag)
+    automaton.make_automaton()
+    return automaton
+
+
+# Aho-Corasick matches every keyword in a single linear pass regardless of how many there are.
+_CAT_AC = _build_category_automaton() if ahocorasick is not None else None
+
+
+def _first_sentence(body: str, limit: int = 140) -> str:
+    """Return the text before the first sentence terminator, capped at ``limit`` characters."""
+    # Only the first ``limit`` characters can end up in the result, and each search is
+    # narrowed to the earliest terminator found so far, so long bodies are never fully scanned.
+    end = min(len(body), limit)
+    for mark in ".!?":
+        idx = body.find(mark, 0, end)
+        if idx != -1:
+            end = idx
+    return body[:end]
 
 
 class MockLLMClient:
@@ -9,44 +80,38 @@ class MockLLMClient:
     def __init__(self) -> None:
         self.now = datetime.utcnow
 
-    def categorize_email(self, email: Dict[str, Any], prompt: str) -> List[str]:
+    def categorize_email(self, email: Dict[str, Any], prompt: str) -> Sequence[str]:
         """Infer simple category tags based on keyword heuristics."""
         text = f"{email.get('subject', '')} {email.get('body', '')}".lower()
-        tags: List[str] = []
-        if any(word in text for word in ["urgent", "asap", "immediately"]):
-            tags.append("urgent")
-        if any(word in text for word in ["meeting", "schedule", "calendar"]):
-            tags.append("meeting")
-        if any(word in text for word in ["invoice", "payment", "billing", "budget"]):
-            tags.append("finance")
-        if any(word in text for word in ["update", "status", "progress"]):
-            tags.append("status")
-        if not tags:
-            tags.append("general")
-        return tags
+        if _CAT_AC is not None:
+            found = frozenset(tag for _, tag in _CAT_AC.iter(text))
+        else:
+            # Substring checks run in C, which beats any per-position regex scan here.
+            found = frozenset(tag for tag, words in CATEGORY_KEYWORDS if any(word in text for word in words))
+        return _TAG_RESULTS[found]
 
     def extract_actions(self, email: Dict[str, Any], prompt: str) -> List[str]:
         """Pull out basic action items by scanning for imperative or request cues."""
         body = email.get("body", "")
-        actions: List[str] = []
-        for line in body.splitlines():
-            lowered = line.strip().lower()
-            if not lowered:
-                continue
-            if lowered.startswith(("please", "kindly", "action:", "todo:", "request:")):
-                actions.append(line.strip())
-            elif any(token in lowered for token in ["due", "deadline", "send", "review", "approve"]):
-                actions.append(line.strip())
+        actions: List[str] = [match.group().strip() for match in _ACTION_LINE_RE.finditer(body)]
         if not actions:
             actions.append("No explicit action items detected.")
         return actions
 
+    def categorize_batch(self, emails: Sequence[Dict[str, Any]], prompt: str) -> List[Sequence[str]]:
+        """Categorize several emails in one call; a hosted model would take them as one request."""
+        return [self.categorize_email(email, prompt) for email in emails]
+
+    def extract_actions_batch(self, emails: Sequence[Dict[str, Any]], prompt: str) -> List[List[str]]:
+        """Extract action items for several emails in one call."""
+        return [self.extract_actions(email, prompt) for email in emails]
+
     def summarize(self, email: Dict[str, Any], prompt: str) -> str:
         """Return a short, human-readable summary."""
         sender = email.get("from", "Unknown")
         subject = email.get("subject", "No subject")
         body = email.get("body", "")
-        first_sentence = re.split(r"[.!?]", body)[0][:140] if body else ""
+        first_sentence = _first_sentence(body)
         summary = f"{sender} wrote about '{subject}'. {first_sentence}".strip()
         return summary
 
@@ -56,15 +121,15 @@ class MockLLMClient:
         prompt: str,
         tone: str = "neutral",
         include_followups: bool = True,
-        categories: Optional[List[str]] = None,
-        actions: Optional[List[str]] = None,
+        *,
+        categories: Sequence[str],
+        actions: Sequence[str],
+        generated_at: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Create a basic reply draft using tone guidance and available context."""
+        """Create a basic reply draft from already computed categories and actions."""
         subject = email.get("subject", "Re: (no subject)")
         sender = email.get("from", "Recipient")
         summary = self.summarize(email, prompt)
-        categories = categories or []
-        actions = actions or []
         body_lines = [
             f"Hi {sender},",
             "",
@@ -76,9 +141,18 @@ class MockLLMClient:
             "Best,",
             "Your Email Agent",
         ]
-        draft = {
-            "subject": f"Re: {subject}",
+        draft: Dict[str, Any] = {
+            "subject": self._reply_subject(email),
             "body": "\n".join(body_lines),
+            "followups": [],
+            "metadata": {
+                "summary": summary,
+                "generated_at": generated_at or self.now().isoformat() + "Z",
+                "tone": tone,
+                "categories": categories,
+                "actions": actions,
+                "prompt_used": prompt,
+            },
         }
         if include_followups:
             draft["followups"] = [
@@ -87,39 +161,111 @@ class MockLLMClient:
             ]
             if actions:
                 draft["followups"].append(f"Review action items: {', '.join(actions[:3])}")
-        draft["metadata"] = {
-            "summary": summary,
-            "generated_at": self.now().isoformat() + "Z",
-            "tone": tone,
+        return draft
+
+    def _reply_subject(self, email: Dict[str, Any]) -> str:
+        return f"Re: {email.get('subject', 'Re: (no subject)')}"
+
+    def _ensure_processed_entry(
+        self,
+        email: Dict[str, Any],
+        email_id: str,
+        prompts: Dict[str, str],
+        processed_lookup: Dict[str, Dict[str, Any]],
+        tone: str = "neutral",
+    ) -> Dict[str, Any]:
+        if email_id in processed_lookup:
+            return processed_lookup[email_id]
+        categories = self.categorize_email(email, prompts.get("categorization_prompt", ""))
+        actions = self.extract_actions(email, prompts.get("action_item_prompt", ""))
+        draft = self.draft_reply(
+            email,
+            prompts.get("auto_reply_prompt", ""),
+            tone=tone,
+            categories=categories,
+            actions=actions,
+        )
+        processed_lookup[email_id] = {
+            "id": email.get("id"),
             "categories": categories,
             "actions": actions,
-            "prompt_used": prompt,
+            "draft": draft,
         }
-        return draft
+        return processed_lookup[email_id]
 
     def answer_question(
         self,
         email: Dict[str, Any],
         user_query: str,
         prompts: Dict[str, str],
+        processed: Optional[Dict[str, Any]] = None,
     ) -> str:
-        """Route the user query to the appropriate helper."""
+        """Route the user query to the appropriate helper for a single email."""
         lowered = user_query.lower()
+        categories = processed.get("categories") if processed else None
+        actions = processed.get("actions") if processed else None
         if "summarize" in lowered:
             return self.summarize(email, prompts.get("categorization_prompt", ""))
         if "task" in lowered or "action" in lowered:
-            actions = self.extract_actions(email, prompts.get("action_item_prompt", ""))
-            return "\n".join(actions)
+            use_actions = actions or self.extract_actions(email, prompts.get("action_item_prompt", ""))
+            return "\n".join(use_actions)
         if "reply" in lowered or "draft" in lowered:
+            tone = "friendly" if "friendly" in lowered else "neutral"
             draft = self.draft_reply(
                 email,
                 prompts.get("auto_reply_prompt", ""),
-                tone="friendly" if "friendly" in lowered else "neutral",
+                tone=tone,
+                categories=categories or self.categorize_email(email, prompts.get("categorization_prompt", "")),
+                actions=actions or self.extract_actions(email, prompts.get("action_item_prompt", "")),
             )
             return f"Subject: {draft['subject']}\n\n{draft['body']}"
-        if "urgent" in lowered or "show me all urgent" in lowered:
-            tags = self.categorize_email(email, prompts.get("categorization_prompt", ""))
-            if "urgent" in tags:
-                return "This email is tagged as urgent."
-            return "This email does not appear urgent."
+        if "urgent" in lowered or "priority" in lowered:
+            tags = categories or self.categorize_email(email, prompts.get("categorization_prompt", ""))
+            return "This email is tagged as urgent." if "urgent" in tags else "This email does not appear urgent."
         return "Here's a quick summary: " + self.summarize(email, prompts.get("categorization_prompt", ""))
+
+    def answer_inbox_question(
+        self,
+        emails: List[Dict[str, Any]],
+        processed: List[Dict[str, Any]],
+        user_query: str,
+        prompts: Dict[str, str],
+    ) -> str:
+        """Handle inbox-level questions such as urgent filter or task rollups."""
+        lowered = user_query.lower()
+        processed_lookup = {str(item.get("id")): item for item in processed}
+        # Column-wise views of the inbox so each branch is a single pass over flat lists.
+        ids = [email.get("id") for email in emails]
+        email_ids = [str(email_id) for email_id in ids]
+        entries = [
+            self._ensure_processed_entry(email, email_id, prompts, processed_lookup, tone="neutral")
+            for email, email_id in zip(emails, email_ids)
+        ]
+        subjects = [email.get("subject") for email in emails]
+        timestamps = [email.get("timestamp", "") for email in emails]
+        lines = [f"#{email_id} {subject} — {ts}" for email_id, subject, ts in zip(ids, subjects, timestamps)]
+
+        if "urgent" in lowered:
+            is_urgent = ["urgent" in entry["categories"] for entry in entries]
+            urgent = [line for line, flag in zip(lines, is_urgent) if flag]
+            return "\n".join(urgent) if urgent else "No urgent emails at the moment."
+
+        if "task" in lowered or "action" in lowered:
+            return "\n".join(
+                f"{line} -> " + "; ".join(entry.get("actions", [])) for line, entry in zip(lines, entries)
+            )
+
+        if "summarize" in lowered or "overview" in lowered:
+            summary_prompt = prompts.get("categorization_prompt", "")
+            return "\n".join(
+                f"{line} :: {self.summarize(email, summary_prompt)}" for line, email in zip(lines, emails)
+            )
+
+        if "draft" in lowered or "reply" in lowered:
+            # The rollup only lists reply subjects, so skip composing full draft bodies.
+            return "\n".join(f"{line} -> {self._reply_subject(email)}" for line, email in zip(lines, emails))
+
+        total = len(emails)
+        processed_count = len(processed_lookup)
+        return f"Processed {processed_count} of {total} emails. Try asking for urgent emails, summaries, or tasks."
+
@@ -1,6 +1,9 @@
-import json
+import threading
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+from backend.json_io import read_json, write_json
 
 
 class PromptsStore:
@@ -8,7 +11,9 @@ class PromptsStore:
 
     def __init__(self, path: Path) -> None:
         self.path = path
+        self._lock = threading.Lock()
         self.prompts = self.load()
+        self._snapshot: Mapping[str, str] = MappingProxyType(self.prompts)
 
     def load(self) -> Dict[str, str]:
         if not self.path.exists():
@@ -17,18 +22,19 @@ class PromptsStore:
                 "action_item_prompt": "",
                 "auto_reply_prompt": "",
             }
-        with self.path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(self.path)
 
     def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(self.prompts, f, indent=2)
+        write_json(self.path, self.prompts)
 
     def update(self, updates: Dict[str, str]) -> None:
-        self.prompts.update(updates)
-        self.save()
-
-    def get_all(self) -> Dict[str, str]:
-        return dict(self.prompts)
+        # Swap in a new dict so snapshots handed out earlier keep their contents.
+        with self._lock:
+            self.prompts = {**self.prompts, **updates}
+            self._snapshot = MappingProxyType(self.prompts)
+            self.save()
+
+    def get_all(self) -> Mapping[str, str]:
+        """Return a read-only view of the prompts; it is rebuilt only when prompts change."""
+        return self._snapshot
 
@@ -1,40 +1,87 @@
-import json
+import threading
 from pathlib import Path
 from typing import Any, Dict, List
 
+from backend.json_io import append_json_line, read_json, read_json_lines, write_json
+
+COMPACT_EVERY = 50
+
 
 class DraftStore:
-    """Persist drafts locally as JSON."""
+    """Persist drafts locally as JSON.
+
+    Updates are appended to a sibling ``.ndjson`` log and folded back into the JSON
+    file every ``compact_every`` writes (and on startup), so saving a draft does not
+    rewrite every other draft. One instance may be shared by several threads, so
+    updates are serialized by a lock.
+    """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, compact_every: int = COMPACT_EVERY) -> None:
         self.path = path
+        self.log_path = path.with_suffix(".ndjson")
+        self.compact_every = compact_every
+        self._pending = 0
+        self._lock = threading.Lock()
         self.drafts = self.load()
+        self._id_index = self._build_index(self.drafts)
+        self._next_id = self._max_id(self.drafts) + 1
+        if self.log_path.exists():
+            self.save()
 
     def load(self) -> List[Dict[str, Any]]:
-        if not self.path.exists():
-            return []
-        with self.path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        drafts: List[Dict[str, Any]] = read_json(self.path) if self.path.exists() else []
+        if self.log_path.exists():
+            index = self._build_index(drafts)
+            for draft in read_json_lines(self.log_path):
+                self._upsert(drafts, index, draft)
+        return drafts
 
     def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(self.drafts, f, indent=2)
+        write_json(self.path, self.drafts)
+        self.log_path.unlink(missing_ok=True)
+        self._pending = 0
 
-    def add_or_update(self, draft: Dict[str, Any]) -> None:
+    @staticmethod
+    def _build_index(drafts: List[Dict[str, Any]]) -> Dict[Any, int]:
+        index: Dict[Any, int] = {}
+        for idx, draft in enumerate(drafts):
+            index.setdefault(draft.get("id"), idx)
+        return index
+
+    @staticmethod
+    def _max_id(drafts: List[Dict[str, Any]]) -> int:
+        return max((draft["id"] for draft in drafts if isinstance(draft.get("id"), int)), default=0)
+
+    @staticmethod
+    def _upsert(drafts: List[Dict[str, Any]], index: Dict[Any, int], draft: Dict[str, Any]) -> None:
         draft_id = draft.get("id")
-        if draft_id is None:
-            draft["id"] = len(self.drafts) + 1
+        idx = index.get(draft_id)
+        if idx is None:
+            index[draft_id] = len(drafts)
+            drafts.append(draft)
+        else:
+            drafts[idx] = draft
+
+    def add_or_update(self, draft: Dict[str, Any]) -> None:
+        with self._lock:
+            self._add_or_update(draft)
+
+    def _add_or_update(self, draft: Dict[str, Any]) -> None:
+        if draft.get("id") is None:
+            # New ids come after every existing one: replaying the log upserts by id, so
+            # reusing an id would overwrite the older draft on the next load.
+            draft["id"] = self._next_id
+            self._id_index.setdefault(draft["id"], len(self.drafts))
             self.drafts.append(draft)
         else:
-            for idx, existing in enumerate(self.drafts):
-                if existing.get("id") == draft_id:
-                    self.drafts[idx] = draft
-                    break
-            else:
-                self.drafts.append(draft)
-        self.save()
+            self._upsert(self.drafts, self._id_index, draft)
+        if isinstance(draft["id"], int):
+            self._next_id = max(self._next_id, draft["id"] + 1)
+        append_json_line(self.log_path, draft)
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self.save()
 
     def all(self) -> List[Dict[str, Any]]:
-        return list(self.drafts)
-
+        with self._lock:
+            return list(self.drafts)
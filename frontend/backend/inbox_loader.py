@@ -1,18 +1,100 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, TypeVar
+
+from backend.json_io import read_json_mapped
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback keeps the backend importable
+    orjson = None
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+EmailT = TypeVar("EmailT", bound=Mapping[str, Any])
 
 
 def load_mock_inbox(inbox_path: Path) -> List[Dict[str, Any]]:
     """Load mock inbox JSON from assets."""
     if not inbox_path.exists():
         return []
-    with inbox_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return read_json_mapped(inbox_path)
+
+
+def iter_mock_inbox(inbox_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield inbox emails one at a time, streaming the file with ijson when it is installed."""
+    if not inbox_path.exists():
+        return
+    if ijson is None:
+        yield from load_mock_inbox(inbox_path)
+        return
+    with inbox_path.open("rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def _loads_upload(data: bytes) -> Any:
+    # orjson only takes BOM-less UTF-8, while json.loads also detects a BOM and UTF-16/32,
+    # so anything the stdlib accepts still loads.
+    if orjson is None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data[len(UTF8_BOM) :] if data.startswith(UTF8_BOM) else data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def _is_plain_utf8(fileobj: BinaryIO) -> bool:
+    # ijson only reads BOM-less UTF-8; a BOM or the NUL bytes of UTF-16/32 need the stdlib.
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    return not head.startswith(UTF8_BOM) and b"\x00" not in head
+
+
+def iter_uploaded_inbox(fileobj: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Yield emails from an uploaded JSON array, raising on the first record that is not an object.
+
+    Uploads are already held in memory, so with orjson installed the buffer is parsed in one call.
+    Otherwise ijson streams plain UTF-8 arrays item by item, with the stdlib parser as the last
+    resort.
+    """
+    if orjson is not None or ijson is None or not _is_plain_utf8(fileobj):
+        data = fileobj.getvalue() if hasattr(fileobj, "getvalue") else fileobj.read()
+        records = _loads_upload(data)
+        if not isinstance(records, list):
+            raise ValueError("Uploaded file must be a JSON array of email objects.")
+    else:
+        first_event = next(ijson.parse(fileobj), None)
+        fileobj.seek(0)
+        if first_event is None or first_event[1] != "start_array":
+            raise ValueError("Uploaded file must be a JSON array of email objects.")
+        records = ijson.items(fileobj, "item", use_float=True)
+    for position, email in enumerate(records, start=1):
+        if not isinstance(email, dict):
+            raise ValueError(f"Record {position} is not an email object.")
+        yield email
+
+
+def build_inbox_index(emails: Iterable[EmailT]) -> Dict[str, EmailT]:
+    """Map stringified ids to emails, keeping the first email when an id repeats."""
+    index: Dict[str, EmailT] = {}
+    for email in emails:
+        index.setdefault(str(email.get("id")), email)
+    return index
 
 
-def find_email(emails: List[Dict[str, Any]], email_id: str) -> Optional[Dict[str, Any]]:
-    """Return an email by id if present."""
+def find_email(
+    emails: List[Dict[str, Any]],
+    email_id: str,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return an email by id if present, using a prebuilt index when one is given."""
+    if index is not None:
+        return index.get(str(email_id))
     for email in emails:
         if str(email.get("id")) == str(email_id):
             return email
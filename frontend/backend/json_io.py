@@ -0,0 +1,104 @@
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Mapping
+
+# mkstemp creates files as 0600; new JSON files get the usual umask-based mode instead.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback keeps the backend importable
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def canonical_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes with sorted keys, suitable for hashing."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, default=_default, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: Path) -> Any:
+    """Load a JSON document from disk in a single read."""
+    return loads(path.read_bytes())
+
+
+def read_json_mapped(path: Path) -> Any:
+    """Parse a JSON file straight from a read-only memory map when orjson is available.
+
+    The file is never copied into a Python bytes object, so peak memory stays close to the
+    size of the parsed result.
+    """
+    if orjson is None or path.stat().st_size == 0:
+        return read_json(path)
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def write_json(path: Path, obj: Any) -> None:
+    """Atomically replace a JSON document on disk via a temp file and a single write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp file per write, so concurrent writers never replace each other's file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps(obj))
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def append_json_line(path: Path, obj: Any) -> None:
+    """Append one compact JSON record to a newline-delimited log."""
+    if orjson is not None:
+        line = orjson.dumps(obj, default=_default)
+    else:
+        line = json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f:
+        f.write(line + b"\n")
+
+
+def read_json_lines(path: Path) -> List[Any]:
+    """Load every record of a newline-delimited log, ignoring a torn final line."""
+    lines = [line for line in path.read_bytes().splitlines() if line.strip()]
+    records: List[Any] = []
+    for position, line in enumerate(lines, start=1):
+        try:
+            records.append(loads(line))
+        except ValueError:
+            if position != len(lines):
+                raise
+    return records
@@ -0,0 +1,530 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+try:
+    from st_aggrid import AgGrid, GridOptionsBuilder
+except ImportError:  # pragma: no cover - optional interactive inbox grid
+    AgGrid = None
+
+from backend.inbox_loader import build_inbox_index, find_email, iter_uploaded_inbox, load_mock_inbox
+
+if TYPE_CHECKING:
+    from backend.draft_store import DraftStore
+    from backend.email_processor import EmailProcessor
+    from backend.llm_client import MockLLMClient
+    from backend.prompts_store import PromptsStore
+
+
+@st.cache_resource
+def get_prompts_store(path: Path) -> PromptsStore:
+    from backend.prompts_store import PromptsStore
+
+    return PromptsStore(path)
+
+
+@st.cache_resource
+def get_draft_store(path: Path) -> DraftStore:
+    from backend.draft_store import DraftStore
+
+    return DraftStore(path)
+
+
+@st.cache_resource
+def get_llm_client() -> MockLLMClient:
+    from backend.llm_client import MockLLMClient
+
+    return MockLLMClient()
+
+
+@st.cache_resource
+def get_processor(state_path: Path, _llm_client: MockLLMClient) -> EmailProcessor:
+    from backend.email_processor import EmailProcessor
+
+    return EmailProcessor(state_path, llm_client=_llm_client)
+
+
+@st.cache_resource
+def load_mock_emails(inbox_path: Path) -> Tuple[Mapping[str, Any], ...]:
+    # Read-only views shared by every session; cache_resource hands them out without copying.
+    return tuple(MappingProxyType(email) for email in load_mock_inbox(inbox_path))
+
+
+def set_emails(
+    emails: Sequence[Mapping[str, Any]], index: Optional[Mapping[str, Mapping[str, Any]]] = None
+) -> None:
+    # Version tokens are unique across sessions because st.cache_data is process-wide.
+    st.session_state["emails"] = emails
+    st.session_state["emails_by_id"] = index if index is not None else build_inbox_index(emails)
+    st.session_state["email_ids"] = tuple(str(email.get("id")) for email in emails)
+    st.session_state["emails_version"] = uuid.uuid4().hex
+
+
+def set_processed(processed: List[Dict[str, Any]]) -> None:
+    st.session_state["processed"] = processed
+    st.session_state["processed_version"] = uuid.uuid4().hex
+
+
+def set_prompts(prompts: Mapping[str, str]) -> None:
+    # Frozen so cached results cannot be poisoned; the sorted tuple is the cache key, built once per save.
+    st.session_state["prompts"] = MappingProxyType(dict(prompts))
+    st.session_state["prompts_key"] = tuple(sorted(prompts.items()))
+
+
+def process_inbox(processor: EmailProcessor) -> None:
+    set_processed(
+        asyncio.run(
+            processor.aingest(
+                st.session_state["emails"],
+                st.session_state["prompts"],
+                batch_size=st.session_state.get("batch_size", 32),
+            )
+        )
+    )
+
+
+def get_processed_map() -> Dict[str, Dict[str, Any]]:
+    """Return the id -> processed entry map, rebuilt only when the processed list changes."""
+    version = st.session_state["processed_version"]
+    cached_version, processed_map = st.session_state.get("processed_map", (None, {}))
+    if cached_version != version:
+        processed_map = {str(item.get("id")): item for item in st.session_state["processed"]}
+        st.session_state["processed_map"] = (version, processed_map)
+    return processed_map
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_answer(
+    _llm_client: MockLLMClient,
+    _email: Dict[str, Any],
+    _processed: Optional[Dict[str, Any]],
+    email_id: str,
+    user_query: str,
+    prompts: Tuple[Tuple[str, str], ...],
+    emails_version: str,
+    processed_version: str,
+) -> str:
+    return _llm_client.answer_question(_email, user_query, dict(prompts), processed=_processed)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_inbox_answer(
+    _llm_client: MockLLMClient,
+    _emails: List[Dict[str, Any]],
+    _processed: List[Dict[str, Any]],
+    user_query: str,
+    prompts: Tuple[Tuple[str, str], ...],
+    emails_version: str,
+    processed_version: str,
+) -> str:
+    return _llm_client.answer_inbox_question(_emails, _processed, user_query, dict(prompts))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_reply_draft(
+    _llm_client: MockLLMClient,
+    _email: Dict[str, Any],
+    _processed: Dict[str, Any],
+    email_id: str,
+    prompts: Tuple[Tuple[str, str], ...],
+    emails_version: str,
+    processed_version: str,
+) -> Dict[str, Any]:
+    prompt_map = dict(prompts)
+    categories = _processed.get("categories") or _llm_client.categorize_email(
+        _email, prompt_map.get("categorization_prompt", "")
+    )
+    actions = _processed.get("actions") or _llm_client.extract_actions(
+        _email, prompt_map.get("action_item_prompt", "")
+    )
+    return _llm_client.draft_reply(
+        _email,
+        prompt_map.get("auto_reply_prompt", ""),
+        categories=categories,
+        actions=actions,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_insights(
+    _emails: List[Dict[str, Any]],
+    _processed_map: Dict[str, Dict[str, Any]],
+    emails_version: str,
+    processed_version: str,
+) -> Tuple[List[str], List[str]]:
+    urgent: List[str] = []
+    actions_rollup: List[str] = []
+    lookup = _processed_map.get
+    for email in _emails:
+        email_id = email.get("id")
+        subject = email.get("subject")
+        processed = lookup(str(email_id), {})
+        if "urgent" in processed.get("categories", ()):
+            urgent.append(f"#{email_id} {subject} — {email.get('timestamp', '')}")
+        actions_rollup.append(f"#{email_id} {subject}: " + "; ".join(processed.get("actions", ())))
+    return urgent, actions_rollup
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_inbox_df(
+    _emails: List[Dict[str, Any]],
+    _processed_map: Dict[str, Dict[str, Any]],
+    emails_version: str,
+    processed_version: str,
+) -> pd.DataFrame:
+    rows = []
+    for email in _emails:
+        processed = _processed_map.get(str(email.get("id")), {})
+        rows.append(
+            {
+                "ID": email.get("id"),
+                "From": email.get("from"),
+                "Subject": email.get("subject"),
+                "Timestamp": email.get("timestamp"),
+                "Categories": ", ".join(processed.get("categories", [])),
+            }
+        )
+    return pd.DataFrame(rows, columns=["ID", "From", "Subject", "Timestamp", "Categories"])
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_processed_details_md(
+    _emails: List[Dict[str, Any]],
+    _processed_map: Dict[str, Dict[str, Any]],
+    emails_version: str,
+    processed_version: str,
+) -> str:
+    sections = []
+    for email in _emails:
+        processed = _processed_map.get(str(email.get("id")), {})
+        lines = [
+            f"**#{email.get('id')} {email.get('subject', '')}**  ",
+            f"*{email.get('timestamp', '')}*",
+            "",
+            "Categories: " + (", ".join(f"`{tag}`" for tag in processed.get("categories", [])) or "—"),
+            "",
+            "Actions:",
+        ]
+        lines.extend(f"- {action}" for action in processed.get("actions", []))
+        if processed.get("draft"):
+            lines.extend(["", "```json", json.dumps(processed["draft"], indent=2, ensure_ascii=False), "```"])
+        sections.append("\n".join(lines))
+    return "\n\n---\n\n".join(sections)
+
+
+def ensure_session_defaults(prompts_store: PromptsStore, processor: EmailProcessor, inbox_path: Path) -> None:
+    if "emails" not in st.session_state:
+        set_emails(load_mock_emails(inbox_path))
+    if "processed" not in st.session_state:
+        set_processed(processor.state.get("processed", []))
+    if "prompts" not in st.session_state:
+        set_prompts(prompts_store.get_all())
+    if "draft_editor" not in st.session_state:
+        st.session_state["draft_editor"] = {"subject": "", "body": "", "email_id": None, "metadata": {}, "followups": []}
+    st.session_state.setdefault("draft_subject", st.session_state["draft_editor"].get("subject", ""))
+    st.session_state.setdefault("draft_body", st.session_state["draft_editor"].get("body", ""))
+
+
+def render_prompt_editor(prompts_store: PromptsStore) -> None:
+    st.subheader("Prompt Brain")
+    with st.form("prompt_editor"):
+        categorization = st.text_area(
+            "Categorization Prompt",
+            st.session_state["prompts"].get("categorization_prompt", ""),
+            height=120,
+        )
+        action_prompt = st.text_area(
+            "Action Item Prompt",
+            st.session_state["prompts"].get("action_item_prompt", ""),
+            height=120,
+        )
+        auto_reply = st.text_area(
+            "Auto-Reply Draft Prompt",
+            st.session_state["prompts"].get("auto_reply_prompt", ""),
+            height=120,
+        )
+        submitted = st.form_submit_button("Save Prompts")
+        if submitted:
+            updates = {
+                "categorization_prompt": categorization,
+                "action_item_prompt": action_prompt,
+                "auto_reply_prompt": auto_reply,
+            }
+            prompts_store.update(updates)
+            set_prompts(prompts_store.get_all())
+            st.success("Prompts saved.")
+
+
+def render_inbox(processor: EmailProcessor) -> Dict[str, Dict[str, Any]]:
+    st.subheader("Inbox")
+    if st.button("Process Inbox", use_container_width=True):
+        process_inbox(processor)
+        st.success("Inbox processed with current prompts.")
+
+    processed_map = get_processed_map()
+    inbox_df = build_inbox_df(
+        st.session_state["emails"],
+        processed_map,
+        st.session_state["emails_version"],
+        st.session_state["processed_version"],
+    )
+    render_inbox_table(inbox_df)
+    with st.expander("Processed details (actions & drafts)"):
+        # One cached markdown element instead of several widgets per email.
+        st.markdown(
+            render_processed_details_md(
+                st.session_state["emails"],
+                processed_map,
+                st.session_state["emails_version"],
+                st.session_state["processed_version"],
+            )
+        )
+    return processed_map
+
+
+def render_inbox_table(inbox_df: pd.DataFrame) -> None:
+    """Show the inbox, letting a row selection in the AgGrid drive the email detail panels."""
+    if AgGrid is None:
+        st.dataframe(inbox_df, use_container_width=True, hide_index=True)
+        return
+    options = GridOptionsBuilder.from_dataframe(inbox_df)
+    options.configure_selection("single")
+    grid = AgGrid(
+        inbox_df,
+        gridOptions=options.build(),
+        # Only a selection reruns the script; sorting and filtering stay in the browser.
+        update_on=["selectionChanged"],
+        key="inbox-grid",
+    )
+    selected = grid["selected_rows"]
+    if isinstance(selected, pd.DataFrame):
+        selected = selected.to_dict("records")
+    if selected is not None and len(selected):
+        st.session_state["selected_email_id"] = str(selected[0]["ID"])
+
+
+def render_email_detail(processed_map: Dict[str, Dict[str, Any]], key_prefix: str = "") -> Dict[str, Any]:
+    email_ids = st.session_state["email_ids"]
+    if AgGrid is not None:
+        selected_id = st.session_state.get("selected_email_id")
+        if selected_id not in st.session_state["emails_by_id"]:
+            selected_id = email_ids[0] if email_ids else None
+    else:
+        widget_key = f"{key_prefix}email_select"
+        selected_id = st.selectbox("Select Email", email_ids, key=widget_key) if email_ids else None
+    if not selected_id:
+        st.info("No emails loaded.")
+        return {}
+    email = find_email(st.session_state["emails"], selected_id, index=st.session_state["emails_by_id"]) or {}
+    st.markdown(f"**From:** {email.get('from')}  \n**Subject:** {email.get('subject')}")
+    st.caption(email.get("timestamp", ""))
+    st.text_area(
+        "Email Content",
+        email.get("body", ""),
+        height=180,
+        disabled=True,
+        key=f"{key_prefix}email_body",
+    )
+    processed = processed_map.get(str(email.get("id")), {})
+    # Fresh results hold shared tag tuples; st.write renders those as a repr, so pass lists.
+    st.write("Categories:", list(processed.get("categories", ())))
+    st.write("Actions:", list(processed.get("actions", ())))
+    return email
+
+
+def render_email_agent(llm_client: MockLLMClient, processed_map: Dict[str, Dict[str, Any]]) -> None:
+    st.subheader("Email Agent (single email)")
+    email = render_email_detail(processed_map, key_prefix="agent_")
+    if not email:
+        return
+    user_query = st.text_input("Ask the agent", placeholder="Summarize this email", key="agent_question")
+    if st.button("Ask", use_container_width=True, key="agent_ask"):
+        email_id = str(email.get("id"))
+        answer = cached_answer(
+            llm_client,
+            email,
+            processed_map.get(email_id),
+            email_id,
+            user_query,
+            st.session_state["prompts_key"],
+            st.session_state["emails_version"],
+            st.session_state["processed_version"],
+        )
+        st.write(answer)
+
+
+def render_inbox_agent(llm_client: MockLLMClient, processor: EmailProcessor) -> None:
+    st.subheader("Inbox Agent (all emails)")
+    user_query = st.text_input(
+        "Ask about your inbox",
+        placeholder="Show me all urgent emails",
+        key="inbox_question",
+    )
+    if st.button("Ask Inbox Agent", use_container_width=True, key="inbox_ask"):
+        if not st.session_state.get("processed"):
+            process_inbox(processor)
+        answer = cached_inbox_answer(
+            llm_client,
+            st.session_state["emails"],
+            st.session_state["processed"],
+            user_query,
+            st.session_state["prompts_key"],
+            st.session_state["emails_version"],
+            st.session_state["processed_version"],
+        )
+        st.write(answer)
+
+
+def render_inbox_insights(
+    llm_client: MockLLMClient,
+    processor: EmailProcessor,
+    processed_map: Dict[str, Dict[str, Any]],
+) -> None:
+    st.subheader("Inbox Insights (quick answers)")
+    if not processed_map:
+        if st.button("Process Inbox Now", use_container_width=True, key="insight_process"):
+            process_inbox(processor)
+            st.rerun()
+        else:
+            st.info("Process the inbox to generate insights.")
+        return
+
+    urgent, actions_rollup = compute_insights(
+        st.session_state["emails"],
+        processed_map,
+        st.session_state["emails_version"],
+        st.session_state["processed_version"],
+    )
+
+    st.write("Urgent emails:")
+    st.write("\n".join(urgent) if urgent else "None detected.")
+    st.write("Action items:")
+    st.write("\n".join(actions_rollup))
+
+
+def render_draft_tools(
+    draft_store: DraftStore,
+    llm_client: MockLLMClient,
+    processed_map: Dict[str, Dict[str, Any]],
+) -> None:
+    st.subheader("Draft Generation")
+    email = render_email_detail(processed_map, key_prefix="draft_")
+    if email:
+        if st.button("Generate Reply Draft", use_container_width=True, key="generate_draft"):
+            email_id = str(email.get("id"))
+            draft = cached_reply_draft(
+                llm_client,
+                email,
+                processed_map.get(email_id, {}),
+                email_id,
+                st.session_state["prompts_key"],
+                st.session_state["emails_version"],
+                st.session_state["processed_version"],
+            )
+            st.session_state["draft_editor"] = {
+                "subject": draft.get("subject", ""),
+                "body": draft.get("body", ""),
+                "email_id": email.get("id"),
+                "metadata": draft.get("metadata", {}),
+                "followups": draft.get("followups", []),
+            }
+            st.session_state["draft_subject"] = draft.get("subject", "")
+            st.session_state["draft_body"] = draft.get("body", "")
+            st.success("Draft generated.")
+
+    if st.button("New Blank Draft", use_container_width=True, key="new_blank_draft"):
+        st.session_state["draft_editor"] = {"subject": "", "body": "", "email_id": None, "metadata": {}, "followups": []}
+        st.session_state["draft_subject"] = ""
+        st.session_state["draft_body"] = ""
+
+    st.text_input("Draft Subject", key="draft_subject")
+    st.text_area("Draft Body", key="draft_body", height=200)
+
+    if st.button("Save Draft", use_container_width=True, key="save_draft"):
+        draft = {
+            "id": st.session_state["draft_editor"].get("id"),
+            "subject": st.session_state["draft_subject"],
+            "body": st.session_state["draft_body"],
+            "email_id": st.session_state["draft_editor"].get("email_id"),
+            "metadata": st.session_state["draft_editor"].get("metadata", {}),
+            "followups": st.session_state["draft_editor"].get("followups", []),
+        }
+        draft_store.add_or_update(draft)
+        st.success("Draft saved.")
+
+    st.caption("Saved Drafts")
+    if draft_store.all():
+        st.json(draft_store.all())
+    else:
+        st.write("No drafts saved yet.")
+
+
+def main(assets_dir: Path) -> None:
+    """Run the app against the prompts, drafts and mock inbox stored in ``assets_dir``."""
+    # The browser keeps the page config for the whole session, so it is only sent on the first run.
+    # A process-wide cache_resource sentinel would skip it for every session after the first.
+    if not st.session_state.get("_page_configured"):
+        st.set_page_config(page_title="Prompt-Driven Email Agent", layout="wide")
+        st.session_state["_page_configured"] = True
+    st.title("Prompt-Driven Email Productivity Agent")
+    st.caption("Phase 1-3: categorization, agent Q&A, and draft generation.")
+
+    # Stores, client and processor are built once per process and reused across reruns.
+    inbox_path = assets_dir / "mock_inbox.json"
+    prompts_store = get_prompts_store(assets_dir / "default_prompts.json")
+    draft_store = get_draft_store(assets_dir / "drafts.json")
+    llm_client = get_llm_client()
+    processor = get_processor(assets_dir / "processed.json", llm_client)
+
+    ensure_session_defaults(prompts_store, processor, inbox_path)
+
+    with st.sidebar:
+        st.header("Inbox Controls")
+        source = st.radio("Email Source", ["Mock Inbox", "Upload JSON", "Connect to Service (coming soon)"])
+        uploaded_file = None
+        if source == "Upload JSON":
+            uploaded_file = st.file_uploader("Upload inbox JSON", type=["json"])
+        st.slider("Processing batch size", min_value=1, max_value=128, value=32, key="batch_size")
+        if st.button("Load Inbox"):
+            if source == "Mock Inbox":
+                set_emails(load_mock_emails(inbox_path))
+                st.success("Loaded mock inbox.")
+            elif source == "Upload JSON":
+                if uploaded_file:
+                    try:
+                        uploaded_emails: List[Dict[str, Any]] = []
+                        uploaded_index: Dict[str, Dict[str, Any]] = {}
+                        for email in iter_uploaded_inbox(uploaded_file):
+                            uploaded_emails.append(email)
+                            uploaded_index.setdefault(str(email.get("id")), email)
+                        set_emails(uploaded_emails, index=uploaded_index)
+                        st.success("Loaded uploaded inbox JSON.")
+                    except Exception as exc:  # noqa: BLE001
+                        st.error(f"Failed to parse JSON: {exc}")
+                else:
+                    st.warning("Please upload a JSON file first.")
+            else:
+                st.info("External email connectors are not implemented in this demo.")
+
+    processed_map = render_inbox(processor)
+    st.markdown("---")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        render_email_agent(llm_client, processed_map)
+        st.markdown("---")
+        render_inbox_agent(llm_client, processor)
+        st.markdown("---")
+        render_inbox_insights(llm_client, processor, processed_map)
+
+    with col2:
+        render_prompt_editor(prompts_store)
+        st.markdown("---")
+        render_draft_tools(draft_store, llm_client, processed_map)